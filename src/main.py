@@ -1,10 +1,12 @@
+import functools
 import time
 import os
 import sys
-from typing import List, Dict, Optional, Any
-from cerebras.cloud.sdk import Cerebras
+import threading
+from typing import TYPE_CHECKING, List, Dict, Optional, Any
 
-cerebras_client = None  # Initialize it to None
+if TYPE_CHECKING:
+    from cerebras.cloud.sdk import Cerebras
 
 # Add the project root to the Python path
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
@@ -13,56 +15,79 @@ sys.path.insert(0, project_root)
 # Import configuration
 from config import MODEL_ID, SYSTEM_MESSAGE, API_KEY, CHAR_DELAY
 
-# Move Cerebras to the module level
-cerebras_client = Cerebras(api_key=API_KEY)
+# lru_cache does not serialize concurrent misses, so the first build is locked
+_client_lock = threading.Lock()
 
-def setup_cerebras_client() -> Cerebras:
+@functools.lru_cache(maxsize=1)
+def _make_cerebras_client() -> "Cerebras":
+    # Import the SDK lazily so paths that never hit the API skip its import cost
+    from cerebras.cloud.sdk import Cerebras
+    return Cerebras(api_key=API_KEY)
+
+def setup_cerebras_client() -> "Cerebras":
     if not API_KEY:
         raise ValueError("Missing Cerebras API Key.")
-    return cerebras_client
+    if _make_cerebras_client.cache_info().currsize:
+        return _make_cerebras_client()
+    with _client_lock:
+        # Re-checked by the cache itself: threads that waited on the lock get a hit
+        return _make_cerebras_client()
 
 def generate_response(
-    client: Cerebras,
+    client: "Cerebras",
     prompt: str,
     chat_history: List[Dict[str, str]]
 ) -> Optional[Any]:
-    chat_history.append({"role": "user", "content": prompt})
+    user_message: Dict[str, str] = {"role": "user", "content": prompt}
     try:
-        return client.chat.completions.create(
-            messages=chat_history,
+        response = client.chat.completions.create(
+            messages=[*chat_history, user_message],
             model=MODEL_ID,
         )
     except Exception as e:
         print(f"Error generating response: {e}")
         return None
 
+    # Only record the turn once the request has gone through
+    chat_history.append(user_message)
+    return response
+
 def print_response(response: Optional[Any]) -> None:
     if response is None:
         print("Failed to generate a response.")
         return
 
     message: str = response.choices[0].message.content
-    for char in message:
-        print(char, end="", flush=True)
-        time.sleep(CHAR_DELAY)
-    print()
+    if CHAR_DELAY <= 0:
+        # No typewriter effect requested; write the whole message at once
+        sys.stdout.write(message + "\n")
+        sys.stdout.flush()
+    else:
+        for char in message:
+            print(char, end="", flush=True)
+            time.sleep(CHAR_DELAY)
+        print()
 
     total_tokens: int = response.usage.total_tokens
     total_time: float = response.time_info.total_time
     tokens_per_second: float = total_tokens / total_time
     print(f"(Tokens per second: {tokens_per_second:.2f})")
 
+# MODEL_ID is fixed for the process, so the banner is rendered once
+_WELCOMING_TEXT = (
+    f"\nWelcome to {MODEL_ID} Text Generator made by (Awan)\n"
+    f"Happy chat and talk with your {MODEL_ID} AI Generative Model\n"
+    "Addhe Warman Putra - (Awan)\n"
+    "Type 'exit()' to exit from program\n"
+)
+
 def get_welcoming_text() -> str:
-    return (
-        f"\nWelcome to {MODEL_ID} Text Generator made by (Awan)\n"
-        f"Happy chat and talk with your {MODEL_ID} AI Generative Model\n"
-        "Addhe Warman Putra - (Awan)\n"
-        "Type 'exit()' to exit from program\n"
-    )
+    return _WELCOMING_TEXT
 
 def main() -> None:
     try:
-        client = setup_cerebras_client()
+        if not API_KEY:
+            raise ValueError("Missing Cerebras API Key.")
         chat_history: List[Dict[str, str]] = [SYSTEM_MESSAGE]
 
         print(get_welcoming_text())
@@ -72,6 +97,8 @@ def main() -> None:
             if user_input.lower() == "exit()":
                 break
 
+            # The SDK is only imported once the user actually sends a prompt
+            client = setup_cerebras_client()
             response: Optional[Any] = generate_response(client, user_input, chat_history)
             if response:
                 chat_history.append({
@@ -1,6 +1,7 @@
 import unittest
 from unittest.mock import patch, MagicMock
 import time
+import threading
 from typing import Any, List, Dict, Optional
 import os
 import sys
@@ -13,17 +14,47 @@ from config import MODEL_ID, SYSTEM_MESSAGE, API_KEY, CHAR_DELAY
 class TestMainModule(unittest.TestCase):
 
     def setUp(self):
-        # Reset the cerebras_client before each test
-        main_module.cerebras_client = None
+        # Reset the cached Cerebras client before each test
+        main_module._make_cerebras_client.cache_clear()
 
-    @patch('src.main.Cerebras')
+    @patch('src.main.API_KEY', 'test-api-key')
+    @patch('cerebras.cloud.sdk.Cerebras')
     def test_setup_cerebras_client(self, mock_cerebras: MagicMock) -> None:
-        """Test that setup_cerebras_client returns the existing client correctly."""
+        """Test that setup_cerebras_client creates the client once and reuses it."""
         client = main_module.setup_cerebras_client()
-        mock_cerebras.assert_not_called()  # Cerebras constructor should not be called
-        self.assertIs(client, main_module.cerebras_client)
+        mock_cerebras.assert_called_once_with(api_key='test-api-key')
+        self.assertIs(client, mock_cerebras.return_value)
 
+        self.assertIs(main_module.setup_cerebras_client(), client)
+        mock_cerebras.assert_called_once()
 
+    @patch('src.main.API_KEY', 'test-api-key')
+    @patch('cerebras.cloud.sdk.Cerebras')
+    def test_setup_cerebras_client_concurrent_first_calls(self, mock_cerebras: MagicMock) -> None:
+        """Test that concurrent first calls to setup_cerebras_client build a single client."""
+        mock_cerebras.side_effect = lambda **kwargs: time.sleep(0.05) or MagicMock()
+        clients: List[Any] = []
+        threads = [
+            threading.Thread(target=lambda: clients.append(main_module.setup_cerebras_client()))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        mock_cerebras.assert_called_once_with(api_key='test-api-key')
+        self.assertEqual(len(clients), 8)
+        self.assertTrue(all(client is clients[0] for client in clients))
+
+    @patch('src.main.API_KEY', None)
+    def test_setup_cerebras_client_missing_key(self) -> None:
+        """Test that setup_cerebras_client refuses to run without an API key."""
+        with self.assertRaises(ValueError):
+            main_module.setup_cerebras_client()
+
+
+    @patch('src.main.CHAR_DELAY', 0.02)
     @patch('builtins.print')
     @patch('time.sleep')
     def test_print_response(self, mock_sleep: MagicMock, mock_print: MagicMock):
@@ -37,6 +68,23 @@ class TestMainModule(unittest.TestCase):
         self.assertEqual(mock_print.call_count, 26)
         self.assertEqual(mock_sleep.call_count, 24)
 
+    @patch('src.main.CHAR_DELAY', 0)
+    @patch('sys.stdout')
+    @patch('builtins.print')
+    @patch('time.sleep')
+    def test_print_response_without_delay(self, mock_sleep: MagicMock, mock_print: MagicMock,
+                                          mock_stdout: MagicMock):
+        """Test that print_response writes the message in one go when CHAR_DELAY is 0."""
+        mock_response = MagicMock()
+        mock_response.choices = [MagicMock(message=MagicMock(content="This is a test response."))]
+        mock_response.usage = MagicMock(total_tokens=20)
+        mock_response.time_info = MagicMock(total_time=0.5)
+
+        main_module.print_response(mock_response)
+        mock_stdout.write.assert_called_once_with("This is a test response.\n")
+        mock_sleep.assert_not_called()
+        self.assertEqual(mock_print.call_count, 1)  # Only the tokens-per-second line
+
     @patch('src.main.setup_cerebras_client')
     def test_generate_response(self, mock_setup: MagicMock) -> None:
         """Test that generate_response interacts with the Cerebras client correctly."""
@@ -51,11 +99,35 @@ class TestMainModule(unittest.TestCase):
         response = main_module.generate_response(mock_client, prompt, chat_history)
 
         mock_client.chat.completions.create.assert_called_once_with(
-            messages=chat_history,
+            messages=[SYSTEM_MESSAGE, {"role": "user", "content": prompt}],
             model=MODEL_ID,
         )
         self.assertEqual(response, mock_response)
+        self.assertEqual(chat_history[-1], {"role": "user", "content": prompt})
+
+    @patch('builtins.print')
+    def test_generate_response_failure_keeps_history(self, mock_print: MagicMock) -> None:
+        """Test that a failed request does not leave the prompt in the chat history."""
+        mock_client = MagicMock()
+        mock_client.chat.completions.create.side_effect = Exception("API error")
 
+        chat_history = [SYSTEM_MESSAGE]
+        response = main_module.generate_response(mock_client, "This is a test prompt.", chat_history)
+
+        self.assertIsNone(response)
+        self.assertEqual(chat_history, [SYSTEM_MESSAGE])
+
+
+    @patch('src.main.API_KEY', 'test-api-key')
+    @patch('builtins.print')
+    @patch('builtins.input', return_value="exit()")
+    @patch('src.main.setup_cerebras_client')
+    def test_main_exit_skips_client_setup(self, mock_setup: MagicMock, mock_input: MagicMock,
+                                          mock_print: MagicMock) -> None:
+        """Test that exiting at the first prompt never sets up the Cerebras client."""
+        main_module.main()
+        mock_input.assert_called_once_with("> ")
+        mock_setup.assert_not_called()
 
     def test_get_welcoming_text(self):
         """Test that get_welcoming_text returns the expected text."""